@@ -4,11 +4,13 @@ Extracts trained weights, biases, and generates sample inputs from trained GAN m
 """
 
 import numpy as np
-from scipy.io import loadmat, savemat
-import json
+
+from q15 import convert_to_fixed_point_q15, format_hex, quantize_q15
 
 def load_trained_model(mat_file='trained_simple_gan.mat'):
     """Load trained GAN parameters from .mat file"""
+    from scipy.io import loadmat  # deferred: scipy is slow to import
+    
     print(f"Loading trained model from {mat_file}...")
     data = loadmat(mat_file)
     
@@ -29,87 +31,88 @@ def load_trained_model(mat_file='trained_simple_gan.mat'):
         'discriminator': {'Wd2': Wd2, 'bd2': bd2, 'Wd3': Wd3, 'bd3': bd3}
     }
 
+def parameter_items(params):
+    """List (name, array) pairs for all parameters in output order"""
+    return [(name, arr)
+            for network in ('generator', 'discriminator')
+            for name, arr in params[network].items()]
+
 def generate_sample_inputs(num_samples=10, latent_dim=2, seed=42):
     """Generate sample latent vectors (noise inputs) for Generator"""
-    np.random.seed(seed)
-    samples = []
-    for i in range(num_samples):
-        noise = np.random.randn(latent_dim, 1)
-        samples.append(noise)
-    return samples
+    # One draw of shape (num_samples, latent_dim, 1); iterating it yields
+    # per-sample (latent_dim, 1) views. A seeded legacy RandomState keeps the
+    # same stream as np.random.seed + randn, so committed samples reproduce.
+    rng = np.random.RandomState(seed)
+    return rng.standard_normal((num_samples, latent_dim, 1))
+
+def format_txt(arr):
+    """Format an array as rows of '%.8f' values, matching np.savetxt for 1-D/2-D input"""
+    arr = np.asarray(arr)
+    if arr.ndim == 1:
+        # np.savetxt writes 1-D arrays one value per line
+        arr = arr[:, np.newaxis]
+    else:
+        # atleast_2d keeps scalars such as bd3 on a single row
+        arr = np.atleast_2d(arr)
+    rows, cols = arr.shape
+    fmt_row = ' '.join(['%.8f'] * cols) + '\n'
+    return (fmt_row * rows) % tuple(arr.ravel())
 
 def save_parameters_to_txt(params, output_dir='./'):
     """Save all parameters to text files (useful for RTL testbench)"""
     print("\n=== Saving parameters to text files ===")
     
-    # Generator parameters
-    np.savetxt(f'{output_dir}Wg2.txt', params['generator']['Wg2'], fmt='%.8f')
-    np.savetxt(f'{output_dir}bg2.txt', params['generator']['bg2'], fmt='%.8f')
-    np.savetxt(f'{output_dir}Wg3.txt', params['generator']['Wg3'], fmt='%.8f')
-    np.savetxt(f'{output_dir}bg3.txt', params['generator']['bg3'], fmt='%.8f')
-    
-    # Discriminator parameters
-    np.savetxt(f'{output_dir}Wd2.txt', params['discriminator']['Wd2'], fmt='%.8f')
-    np.savetxt(f'{output_dir}bd2.txt', params['discriminator']['bd2'], fmt='%.8f')
-    np.savetxt(f'{output_dir}Wd3.txt', params['discriminator']['Wd3'], fmt='%.8f')
-    np.savetxt(f'{output_dir}bd3.txt', params['discriminator']['bd3'].reshape(1, -1), fmt='%.8f')
+    for name, arr in parameter_items(params):
+        with open(f'{output_dir}{name}.txt', 'w') as f:
+            f.write(format_txt(arr))
     
     print(f"Parameters saved to {output_dir}")
 
 def save_parameters_to_json(params, filename='gan_parameters.json'):
     """Save parameters to JSON format"""
-    # Convert numpy arrays to lists
-    params_json = {
-        'generator': {
-            'Wg2': params['generator']['Wg2'].tolist(),
-            'bg2': params['generator']['bg2'].tolist(),
-            'Wg3': params['generator']['Wg3'].tolist(),
-            'bg3': params['generator']['bg3'].tolist()
-        },
-        'discriminator': {
-            'Wd2': params['discriminator']['Wd2'].tolist(),
-            'bd2': params['discriminator']['bd2'].tolist(),
-            'Wd3': params['discriminator']['Wd3'].tolist(),
-            'bd3': params['discriminator']['bd3'].tolist()
-        }
-    }
+    import json
+    
+    def to_json(obj):
+        # Convert numpy arrays lazily, one at a time, as they are encoded
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
     
     with open(filename, 'w') as f:
-        json.dump(params_json, f, indent=2)
+        json.dump(params, f, indent=2, default=to_json)
     print(f"Parameters saved to {filename}")
 
-def convert_to_fixed_point_q15(value):
-    """Convert floating point to Q1.15 fixed-point format (16-bit)"""
-    # Clamp to [-1.0, 0.999969]
-    value = np.clip(value, -1.0, 0.999969)
-    # Scale to Q1.15: multiply by 2^15 = 32768
-    q15_value = np.round(value * 32768).astype(np.int16)
-    return q15_value
+def write_q15_bin(q15_values, filename):
+    """Write already-quantized Q1.15 int16 values as raw little-endian bytes"""
+    q15_values.astype('<i2', copy=False).tofile(filename)
 
-def save_parameters_to_q15_hex(params, output_dir='./'):
-    """Save parameters in Q1.15 fixed-point hex format (for RTL)"""
+def save_q15_bin(arr, filename):
+    """Save an array as raw little-endian Q1.15 int16 values"""
+    write_q15_bin(convert_to_fixed_point_q15(arr), filename)
+
+def save_parameters_to_q15_hex(params, output_dir='./', binary=False):
+    """Save parameters in Q1.15 fixed-point hex format (for RTL)
+    
+    With binary=True, also write each parameter as a raw little-endian
+    int16 *_q15.bin file alongside the hex file.
+    """
     print("\n=== Saving parameters in Q1.15 hex format ===")
     
-    def save_q15_hex(arr, filename):
-        arr_flat = arr.flatten()
-        q15_values = convert_to_fixed_point_q15(arr_flat)
-        with open(filename, 'w') as f:
-            for val in q15_values:
-                # Convert to 16-bit hex (handle negative numbers properly)
-                hex_val = int(val) & 0xFFFF
-                f.write(f"{hex_val:04X}\n")
-    
-    # Save Generator parameters
-    save_q15_hex(params['generator']['Wg2'], f'{output_dir}Wg2_q15.hex')
-    save_q15_hex(params['generator']['bg2'], f'{output_dir}bg2_q15.hex')
-    save_q15_hex(params['generator']['Wg3'], f'{output_dir}Wg3_q15.hex')
-    save_q15_hex(params['generator']['bg3'], f'{output_dir}bg3_q15.hex')
-    
-    # Save Discriminator parameters
-    save_q15_hex(params['discriminator']['Wd2'], f'{output_dir}Wd2_q15.hex')
-    save_q15_hex(params['discriminator']['bd2'], f'{output_dir}bd2_q15.hex')
-    save_q15_hex(params['discriminator']['Wd3'], f'{output_dir}Wd3_q15.hex')
-    save_q15_hex(params['discriminator']['bd3'], f'{output_dir}bd3_q15.hex')
+    items = parameter_items(params)
+    # Quantize every parameter in one pass over a concatenated buffer,
+    # then slice each array's codes back out by offset
+    codes = quantize_q15(np.concatenate([np.ravel(arr) for _, arr in items]))
+    offsets = np.cumsum([0] + [np.size(arr) for _, arr in items])
+    
+    def save_q15_hex(codes, filename):
+        with open(filename, 'w', buffering=1 << 20) as f:
+            f.write(format_hex(codes))
+    
+    for (name, _), lo, hi in zip(items, offsets[:-1], offsets[1:]):
+        save_q15_hex(codes[lo:hi], f'{output_dir}{name}_q15.hex')
+        if binary:
+            # Reuse the fused-pass codes, reinterpreted as signed int16
+            write_q15_bin(codes[lo:hi].view(np.int16), f'{output_dir}{name}_q15.bin')
     
     print(f"Q1.15 hex parameters saved to {output_dir}")
 
@@ -117,17 +120,15 @@ def save_sample_inputs(samples, output_dir='./'):
     """Save sample input vectors"""
     print(f"\n=== Saving {len(samples)} sample inputs ===")
     
-    # Save as text
-    for i, sample in enumerate(samples):
-        np.savetxt(f'{output_dir}input_sample_{i:02d}.txt', sample, fmt='%.8f')
+    # Quantize all samples at once, one row of codes per sample
+    codes = quantize_q15(samples).reshape(len(samples), -1)
     
-    # Save as Q1.15 hex
+    # Save as text and Q1.15 hex in a single pass over the samples
     for i, sample in enumerate(samples):
-        q15_sample = convert_to_fixed_point_q15(sample)
-        with open(f'{output_dir}input_sample_{i:02d}_q15.hex', 'w') as f:
-            for val in q15_sample.flatten():
-                hex_val = int(val) & 0xFFFF
-                f.write(f"{hex_val:04X}\n")
+        prefix = f'{output_dir}input_sample_{i:02d}'
+        with open(f'{prefix}.txt', 'w') as ft, open(f'{prefix}_q15.hex', 'w') as fh:
+            ft.write(format_txt(sample))
+            fh.write(format_hex(codes[i]))
     
     print(f"Sample inputs saved to {output_dir}")
 
@@ -139,11 +140,11 @@ def display_parameters(params):
     print("\nWg2 (3x2) - First layer weights:")
     print(params['generator']['Wg2'])
     print("\nbg2 (3x1) - First layer bias:")
-    print(params['generator']['bg2'].flatten())
+    print(params['generator']['bg2'].ravel())
     print("\nWg3 (9x3) - Second layer weights:")
     print(params['generator']['Wg3'])
     print("\nbg3 (9x1) - Second layer bias:")
-    print(params['generator']['bg3'].flatten())
+    print(params['generator']['bg3'].ravel())
     
     print("\n" + "="*60)
     print("DISCRIMINATOR PARAMETERS")
@@ -151,13 +152,13 @@ def display_parameters(params):
     print("\nWd2 (3x9) - First layer weights:")
     print(params['discriminator']['Wd2'])
     print("\nbd2 (3x1) - First layer bias:")
-    print(params['discriminator']['bd2'].flatten())
+    print(params['discriminator']['bd2'].ravel())
     print("\nWd3 (1x3) - Second layer weights:")
     print(params['discriminator']['Wd3'])
     print("\nbd3 (scalar) - Second layer bias:")
     print(params['discriminator']['bd3'])
 
-def main():
+def main(binary=False):
     """Main extraction function"""
     print("="*60)
     print("Simple-GAN 3x3 Parameter Extraction")
@@ -183,7 +184,7 @@ def main():
     # Save in different formats
     save_parameters_to_txt(params, output_dir='./')
     save_parameters_to_json(params, filename='gan_parameters.json')
-    save_parameters_to_q15_hex(params, output_dir='./')
+    save_parameters_to_q15_hex(params, output_dir='./', binary=binary)
     save_sample_inputs(samples, output_dir='./')
     
     # Print summary
@@ -194,8 +195,15 @@ def main():
     print("  Text format: Wg2.txt, bg2.txt, Wg3.txt, bg3.txt, Wd2.txt, bd2.txt, Wd3.txt, bd3.txt")
     print("  JSON format: gan_parameters.json")
     print("  Q1.15 hex:   *_q15.hex files (for RTL testbench)")
+    if binary:
+        print("  Q1.15 bin:   *_q15.bin files (raw little-endian int16)")
     print("  Inputs:      input_sample_*.txt and input_sample_*_q15.hex")
     print("\nReady for hardware implementation!")
 
 if __name__ == '__main__':
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract Simple-GAN 3x3 parameters")
+    parser.add_argument('--bin', action='store_true',
+                        help="also write raw little-endian int16 *_q15.bin files")
+    main(binary=parser.parse_args().bin)
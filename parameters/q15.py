@@ -0,0 +1,40 @@
+"""
+Q1.15 fixed-point helpers shared by the parameter scripts
+Q1.15 format: 1 sign bit, 15 fractional bits
+Range: -1.0 to +0.999969482421875
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+@lru_cache(maxsize=None)
+def _hex16_table():
+    """Lookup table of 4-digit uppercase hex strings for every 16-bit code"""
+    # Built on first use so importing this module stays cheap
+    return np.array([f"{i:04X}" for i in range(1 << 16)], dtype='<U4')
+
+def convert_to_fixed_point_q15(arr):
+    """Convert a floating point array to flat Q1.15 fixed-point format (16-bit)"""
+    arr = np.asarray(arr, dtype=np.float64)
+    scratch = np.empty(arr.size, dtype=np.float64)
+    # Scale to Q1.15: multiply by 2^15 = 32768 and round
+    np.multiply(arr.ravel(), 32768.0, out=scratch)
+    # rint rounds half to even, like Python 3's round() and the previous
+    # np.round. MATLAB's round() in extract_gan_parameters.m (to_q15) rounds
+    # ties away from zero, so the two can differ by 1 LSB on exact .5 ties.
+    np.rint(scratch, out=scratch)
+    # Saturate to the int16 range [-32768, 32767] (i.e. [-1.0, 0.999969])
+    np.clip(scratch, -32768.0, 32767.0, out=scratch)
+    return scratch.astype(np.int16)
+
+def quantize_q15(arr):
+    """Convert a floating point array to flat unsigned 16-bit Q1.15 codes"""
+    # Two's complement reinterpretation, no copy or per-element masking
+    return convert_to_fixed_point_q15(arr).view(np.uint16)
+
+def format_hex(codes):
+    """Format unsigned 16-bit codes as hex text, one value per line"""
+    if np.size(codes) == 0:
+        return ""
+    return "\n".join(_hex16_table()[codes]) + "\n"
@@ -11,6 +11,11 @@ echo ""
 echo "[Step 1] Converting parameters to Q1.15 hex format..."
 python scripts/convert_params_to_hex.py
 
+if [ $? -ne 0 ]; then
+    echo "ERROR: Parameter conversion failed! (requires Python 3 with NumPy)"
+    exit 1
+fi
+
 # Step 2: Compile with Icarus Verilog
 echo ""
 echo "[Step 2] Compiling Verilog files..."
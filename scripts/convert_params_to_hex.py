@@ -6,48 +6,25 @@ Range: -1.0 to +0.999969482421875
 """
 
 import os
-import struct
+import sys
 
-def float_to_q15_hex(value):
-    """Convert a float to Q1.15 fixed-point hex string."""
-    # Clamp value to Q1.15 range
-    value = max(-1.0, min(value, 0.999969482421875))
-    
-    # Convert to Q1.15: multiply by 2^15 and round
-    q15_val = int(round(value * 32768))
-    
-    # Handle overflow
-    if q15_val > 32767:
-        q15_val = 32767
-    elif q15_val < -32768:
-        q15_val = -32768
-    
-    # Convert to unsigned 16-bit for hex representation
-    if q15_val < 0:
-        q15_val = q15_val + 65536  # Two's complement
-    
-    return format(q15_val, '04X')
+import numpy as np
+
+# Load the shared Q1.15 helpers from this repo's parameters/q15.py
+sys.path.insert(0, os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'parameters')))
+from q15 import format_hex, quantize_q15
 
 def convert_file(input_path, output_path):
     """Convert a parameter file from decimal to hex format."""
-    values = []
-    
+    # Parse all whitespace-separated numbers in file order; rows may differ
+    # in length and an empty file yields no values
     with open(input_path, 'r') as f:
-        for line in f:
-            # Split line by whitespace and parse each number
-            for token in line.strip().split():
-                if token:
-                    try:
-                        val = float(token)
-                        values.append(val)
-                    except ValueError:
-                        print(f"Warning: Could not parse '{token}' in {input_path}")
+        values = np.array(f.read().split(), dtype=np.float64)
     
-    # Write hex values, one per line
-    with open(output_path, 'w') as f:
-        for val in values:
-            hex_val = float_to_q15_hex(val)
-            f.write(hex_val + '\n')
+    # Write hex values, one per line, as a single buffer
+    with open(output_path, 'w', buffering=1 << 20) as f:
+        f.write(format_hex(quantize_q15(values)))
     
     print(f"Converted {input_path} -> {output_path} ({len(values)} values)")
 